@@ -0,0 +1,214 @@
+import io
+import json
+import os
+import glob
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import streamlit as st
+
+# Data layer of the dashboard: grid config, cached loaders and lookup helpers.
+# Paths are relative to the repo root, where `streamlit run app.py` is started.
+
+# ================= GRID CONFIG =================
+GRID_CONFIG = {
+    "rain": {
+        "resolution": 0.25,
+        "lat_min": 6.5,
+        "lat_max": 38.5,
+        "lon_min": 66.5,
+        "lon_max": 100.0
+    },
+    "tmax": {
+        "resolution": 1.0,
+        "lat_min": 7.5,
+        "lat_max": 37.5,
+        "lon_min": 67.5,
+        "lon_max": 97.5
+    },
+    "tmin": {
+        "resolution": 1.0,
+        "lat_min": 7.5,
+        "lat_max": 37.5,
+        "lon_min": 67.5,
+        "lon_max": 97.5
+    }
+}
+
+# Parameter names double as the value column in each year file
+PARAMETERS = list(GRID_CONFIG)
+
+# Column types the dashboard works in; process_data.py writes year files with
+# the same schema, so the read-time cast is a no-op for repacked files
+def year_schema(parameter):
+    return pa.schema([
+        ("date", pa.date32()),
+        ("lat", pa.float32()),
+        ("lon", pa.float32()),
+        (parameter, pa.float32())
+    ])
+
+# Great-circle distance in km between points given in degrees (works on arrays)
+def haversine_np(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    return 2 * 6371.0 * np.arcsin(np.sqrt(a))
+
+# Evenly spaced grid coordinates from start to stop (inclusive)
+def grid_axis(start, stop, res):
+    return (start + res * np.arange(round((stop - start) / res) + 1)).astype(np.float32)
+
+# Position of the coordinate closest to value on a sorted grid axis (ties go low)
+def nearest_index(axis, value):
+    value = axis.dtype.type(value)  # compare in the axis dtype, no upcast of the axis
+    idx = int(np.searchsorted(axis, value))
+    if idx == len(axis) or (idx > 0 and value - axis[idx - 1] <= axis[idx] - value):
+        idx -= 1
+    return idx
+
+# ================= LOADERS =================
+# Years available for a parameter, read once per process from the manifest
+# written by process_data.py. Falls back to the folder listing if there is no
+# manifest or it names a year whose file is gone.
+@st.cache_resource
+def list_years(parameter):
+    manifest = os.path.join("data", parameter, "manifest.json")
+    if os.path.exists(manifest):
+        with open(manifest) as f:
+            years = json.load(f)["years"]
+        if all(os.path.exists(year_file(parameter, year)) for year in years):
+            return years
+    parquet_files = glob.glob(os.path.join("data", parameter, f"*_{parameter}.parquet"))
+    return sorted(os.path.basename(f).split("_")[0] for f in parquet_files)
+
+# Every year file follows the "{year}_{parameter}.parquet" naming
+def year_file(parameter, year):
+    return os.path.join("data", parameter, f"{year}_{parameter}.parquet")
+
+# Date bounds for the year, read from the Parquet statistics instead of the data
+@st.cache_data
+def load_date_range(parameter, year):
+    file = year_file(parameter, year)
+    metadata = pq.ParquetFile(file).metadata
+    col = metadata.schema.names.index("date")
+    stats = [metadata.row_group(i).column(col).statistics for i in range(metadata.num_row_groups)]
+    if all(s is not None and s.has_min_max for s in stats):
+        return pd.Timestamp(min(s.min for s in stats)), pd.Timestamp(max(s.max for s in stats))
+    bounds = pc.min_max(pq.read_table(file, columns=["date"])["date"])
+    return pd.Timestamp(bounds["min"].as_py()), pd.Timestamp(bounds["max"].as_py())
+
+# Decoded year arrays are saved next to the Parquet files and memory-mapped on
+# later cold starts, so a lookup only pages in the bytes it touches. The name
+# carries the source file's size and mtime, so any replaced source (even one
+# restored with an older mtime) gets a fresh cache file.
+def array_cache_file(parameter, year):
+    source = os.stat(year_file(parameter, year))
+    name = f"{year}_{parameter}_{source.st_size}_{source.st_mtime_ns}.npy"
+    return os.path.join("data", parameter, "cache", name)
+
+# Memory-map a cached year array, or None if it is missing, unreadable or not
+# the expected shape (e.g. truncated)
+def read_array_cache(cache_file, shape):
+    if not os.path.exists(cache_file):
+        return None
+    try:
+        values = np.load(cache_file, mmap_mode="r")
+    except (OSError, ValueError):
+        return None
+    return values if values.shape == shape else None
+
+# Write the cache atomically, so no reader ever maps a half-written file,
+# and drop cache files left behind by earlier versions of the source
+def write_array_cache(cache_file, values):
+    cache_dir = os.path.dirname(cache_file)
+    tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(tmp_file, "wb") as f:
+            np.save(f, values)
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        # read-only or full data folder: keep serving from memory
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        return
+    prefix = "_".join(os.path.basename(cache_file).split("_")[:2]) + "_"
+    for old_file in glob.glob(os.path.join(cache_dir, prefix + "*.npy")):
+        if old_file != cache_file:
+            try:
+                os.remove(old_file)
+            except OSError:
+                pass
+
+# Load data for the year as a dense (date, lat, lon) array. Kept as a shared
+# resource so reruns reuse the arrays instead of unpickling a copy each time;
+# a rain year is ~25 MB, so only the most recently used years are kept.
+@st.cache_resource(max_entries=12)
+def load_year_data(parameter, year):
+    grid = GRID_CONFIG[parameter]
+    res = grid["resolution"]
+    file = year_file(parameter, year)
+    cache_file = array_cache_file(parameter, year)
+
+    # Contiguous daily axis, so a date maps to its position by day offset
+    min_date, max_date = load_date_range(parameter, year)
+    dates = np.arange(min_date.to_datetime64().astype("datetime64[D]"),
+                      max_date.to_datetime64().astype("datetime64[D]") + 1)
+    # Axes come from the grid config since all-missing rows/columns are never read
+    lats = grid_axis(grid["lat_min"], grid["lat_max"], res)
+    lons = grid_axis(grid["lon_min"], grid["lon_max"], res)
+
+    values = read_array_cache(cache_file, (len(dates), len(lats), len(lons)))
+    if values is None:
+        # Missing cells stay NaN in the array, so filter them out during the scan;
+        # in files repacked by process_data.py they cluster into skippable row groups
+        table = ds.dataset(file, format="parquet").to_table(
+            columns=["date", "lat", "lon", parameter],
+            filter=pc.field(parameter).is_valid()
+        )
+        table = table.cast(year_schema(parameter))
+
+        values = np.full((len(dates), len(lats), len(lons)), np.nan, dtype=np.float32)
+        values[
+            (table["date"].to_numpy() - dates[0]).astype(np.intp),
+            np.rint((table["lat"].to_numpy() - grid["lat_min"]) / res).astype(np.intp),
+            np.rint((table["lon"].to_numpy() - grid["lon_min"]) / res).astype(np.intp)
+        ] = table[parameter].to_numpy()
+
+        write_array_cache(cache_file, values)
+
+    for arr in (dates, lats, lons, values):
+        arr.flags.writeable = False
+    return dates, lats, lons, values
+
+# Full-year series at one grid point
+def point_series(parameter, year, lat_idx, lon_idx):
+    dates, lats, lons, values = load_year_data(parameter, year)
+    return pd.DataFrame({
+        "date": dates,
+        "lat": lats[lat_idx],
+        "lon": lons[lon_idx],
+        parameter: values[:, lat_idx, lon_idx]
+    })
+
+# CSV export of a point's series, written by Arrow's C++ CSV writer and cached
+# so reruns don't serialize it again
+@st.cache_data(max_entries=64)
+def point_series_csv(parameter, year, lat_idx, lon_idx):
+    dates, lats, lons, values = load_year_data(parameter, year)
+    table = pa.table({
+        "date": dates,
+        "lat": np.full(len(dates), lats[lat_idx]),
+        "lon": np.full(len(dates), lons[lon_idx]),
+        parameter: pa.array(values[:, lat_idx, lon_idx], from_pandas=True)
+    })
+    buf = io.BytesIO()
+    pacsv.write_csv(table, buf)
+    return buf.getvalue()
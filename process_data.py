@@ -1 +1,58 @@
+import glob
+import json
+import os
+import sys
 
+import pyarrow.parquet as pq
+
+from core.weather import PARAMETERS, year_schema
+
+# Rewrites the year files under data/<parameter>/ so readers can prune row groups:
+# rows sorted by (lat, lon, date) in ~100k-row groups with column statistics,
+# stored with the dashboard's core.weather.year_schema (date32 and float32).
+# Also writes data/<parameter>/manifest.json listing the available years, which
+# the dashboard reads instead of scanning the folder.
+# Run from the repo root after adding year files: python process_data.py
+# To only refresh the manifests without repacking: python process_data.py manifest
+
+ROW_GROUP_SIZE = 100_000
+
+
+def repack(file, parameter):
+    table = pq.read_table(file, columns=["date", "lat", "lon", parameter])
+    table = table.cast(year_schema(parameter))
+    table = table.sort_by([("lat", "ascending"), ("lon", "ascending"), ("date", "ascending")])
+    tmp_file = file + ".tmp"
+    pq.write_table(
+        table,
+        tmp_file,
+        row_group_size=ROW_GROUP_SIZE,
+        use_dictionary=True,
+        compression="zstd",
+        write_statistics=True
+    )
+    os.replace(tmp_file, file)
+
+
+def year_files(parameter):
+    return sorted(glob.glob(os.path.join("data", parameter, f"*_{parameter}.parquet")))
+
+
+def write_manifest(parameter):
+    years = sorted(os.path.basename(f).split("_")[0] for f in year_files(parameter))
+    manifest = os.path.join("data", parameter, "manifest.json")
+    tmp_file = manifest + ".tmp"
+    with open(tmp_file, "w") as f:
+        json.dump({"years": years}, f, indent=2)
+    os.replace(tmp_file, manifest)
+
+
+if __name__ == "__main__":
+    manifest_only = sys.argv[1:] == ["manifest"]
+    for parameter in PARAMETERS:
+        if not manifest_only:
+            for file in year_files(parameter):
+                repack(file, parameter)
+                print(f"Repacked {file}")
+        write_manifest(parameter)
+        print(f"Wrote manifest for {parameter}")